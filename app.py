@@ -8,6 +8,8 @@ from flask_cors import CORS
 from utilities import cleanup_old_files
 import logging
 import json
+import threading
+import concurrent.futures
 
 app = Flask(__name__)
 CORS(app)  # 允许跨域请求
@@ -16,11 +18,27 @@ CORS(app)  # 允许跨域请求
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 尝试导入orjson加速元数据和API响应的JSON编解码
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    logger.warning("无法导入orjson库，将使用标准库json进行序列化")
+
+
+def json_response(obj, status=200):
+    """使用orjson（如可用）序列化对象并返回JSON响应"""
+    if orjson is not None:
+        body = orjson.dumps(obj)
+    else:
+        body = json.dumps(obj, ensure_ascii=False).encode('utf-8')
+    return app.response_class(body, status=status, mimetype='application/json')
+
 # 文件目录配置
 UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
 RESULT_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
 METADATA_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'metadata')
-ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'xlsx', 'xls', 'pptx', 'ppt', 'jpg', 'jpeg', 'png', 'txt', 'md', 'dwg'}
+ALLOWED_EXTENSIONS = frozenset({'pdf', 'docx', 'doc', 'xlsx', 'xls', 'pptx', 'ppt', 'jpg', 'jpeg', 'png', 'txt', 'md', 'dwg'})
 
 # 创建必要的目录
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -29,23 +47,212 @@ os.makedirs(METADATA_FOLDER, exist_ok=True)
 
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return os.path.splitext(filename)[1][1:].lower() in ALLOWED_EXTENSIONS
+
+
+def sanitize_filename(filename):
+    """清理客户端提供的文件名，防止目录遍历。
+
+    不使用werkzeug的secure_filename，因为它会剥离中文字符，
+    而本服务需要保留原始中文文件名。只去除路径分量和遍历片段。
+    """
+    # 统一分隔符后只保留最后的文件名部分
+    filename = os.path.basename(filename.replace('\\', '/'))
+    # 去除遍历片段和空字节
+    filename = filename.replace('..', '').replace('\x00', '').strip()
+    return filename
+
+
+def save_upload_stream(file, upload_path):
+    """将上传文件流写入磁盘并返回内容哈希。
+
+    优先使用sendfile零拷贝（随后从页缓存中哈希），
+    否则使用大缓冲区拷贝并在写入时同步计算哈希。
+    """
+    import hashlib
+    stream = file.stream
+    # 如果上传流已落盘（SpooledTemporaryFile溢出），可以直接在内核中sendfile
+    fileno = None
+    try:
+        fileno = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        pass
+
+    if fileno is not None and hasattr(os, 'sendfile'):
+        size = os.fstat(fileno).st_size
+        dst = os.open(upload_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        sent_ok = False
+        try:
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dst, fileno, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            sent_ok = True
+        except OSError as e:
+            logger.warning(f"sendfile写入失败，回退到普通拷贝: {str(e)}")
+        finally:
+            os.close(dst)
+        if sent_ok:
+            # 刚写入的数据还在页缓存中，哈希是内存带宽级别的开销。
+            # hashlib.file_digest要3.11+，本项目支持3.10，手动读循环计算
+            h = hashlib.blake2b(digest_size=16)
+            with open(upload_path, 'rb') as f:
+                while True:
+                    chunk = f.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    h.update(chunk)
+            return h.hexdigest()
+
+    # 回退路径：1MB缓冲区拷贝，比werkzeug默认的小块拷贝减少用户态往返，顺带计算哈希
+    h = hashlib.blake2b(digest_size=16)
+    with open(upload_path, 'wb', buffering=1024 * 1024) as dst_f:
+        while True:
+            chunk = stream.read(1024 * 1024)
+            if not chunk:
+                break
+            h.update(chunk)
+            dst_f.write(chunk)
+    return h.hexdigest()
+
+
+# 字体路径和Tesseract版本在服务生命周期内不变，启动时探测一次
+FONT_CANDIDATES = [
+    r"C:\Windows\Fonts\simhei.ttf",  # 黑体
+    r"C:\Windows\Fonts\simsun.ttc",  # 宋体
+    r"C:\Windows\Fonts\msyh.ttc",    # 微软雅黑
+]
+AVAILABLE_FONTS = [p for p in FONT_CANDIDATES if os.path.exists(p)]
+
+# ReportLab字体名映射
+_FONT_NAME_BY_KEYWORD = {
+    'simhei': 'SimHei',
+    'simsun': 'SimSun',
+    'msyh': 'MicrosoftYaHei',
+}
+
+
+def _register_chinese_fonts():
+    """在启动时把第一个可用的中文字体注册到ReportLab全局字体表。
+
+    pdfmetrics的注册表是进程级的，重复注册只是重复解析TTF文件，
+    注册一次后各处直接用返回的字体名即可。
+    """
+    for font_path in AVAILABLE_FONTS:
+        lowered = font_path.lower()
+        for keyword, font_name in _FONT_NAME_BY_KEYWORD.items():
+            if keyword in lowered:
+                try:
+                    from reportlab.pdfbase import pdfmetrics
+                    from reportlab.pdfbase.ttfonts import TTFont
+                    pdfmetrics.registerFont(TTFont(font_name, font_path))
+                    logger.info("已注册中文字体: %s (%s)", font_name, font_path)
+                    return font_name
+                except Exception as e:
+                    logger.warning(f"注册字体失败 {font_path}: {str(e)}")
+    return None
+
+
+DEFAULT_CN_FONT = _register_chinese_fonts()
+
+
+def _probe_tesseract_version():
+    """探测Tesseract版本，失败时返回None（只在启动时调用一次）"""
+    try:
+        import pytesseract
+        return str(pytesseract.get_tesseract_version())
+    except Exception:
+        return None
+
+
+TESSERACT_VERSION = _probe_tesseract_version()
+
+# 启动时预加载重型转换依赖（tabula的JVM、poppler绑定等），
+# 之后 /api/system-check 直接读取这份结果
+CONVERTER_STATUS = converters.preload()
+
+
+# 转换任务进程池：转换是CPU密集型的（pdf2docx、OCR等），
+# 放到独立进程中执行以绕开GIL，并避免慢转换阻塞其他请求线程。
+# 每个WSGI worker都会建一个进程池，多worker部署时用CONVERT_WORKERS
+# 控制单池大小，避免总进程数按 worker数 × CPU核数 膨胀
+CONVERT_EXECUTOR = concurrent.futures.ProcessPoolExecutor(
+    max_workers=int(os.environ.get('CONVERT_WORKERS', os.cpu_count() or 1)))
+
+
+# 后台清理线程：定期清理过期文件，避免在每个转换请求中同步遍历目录
+_CLEANUP_INTERVAL_SECONDS = 600
+_cleanup_stop_event = threading.Event()
+
+
+def _cleanup_loop():
+    """后台循环，定期清理上传、结果和元数据目录中的过期文件"""
+    while not _cleanup_stop_event.wait(_CLEANUP_INTERVAL_SECONDS):
+        try:
+            cleanup_old_files(UPLOAD_FOLDER, max_age_hours=24)
+            cleanup_old_files(RESULT_FOLDER, max_age_hours=24)
+            cleanup_old_files(METADATA_FOLDER, max_age_hours=24)
+        except Exception as e:
+            logger.error(f"后台清理过期文件时出错: {str(e)}")
+
+
+_cleanup_thread = threading.Thread(target=_cleanup_loop, daemon=True)
+_cleanup_thread.start()
+
+
+def ensure_job_dirs(file_id):
+    """为一次转换任务一次性创建上传和结果子目录，返回两者路径"""
+    temp_upload_dir = os.path.join(UPLOAD_FOLDER, file_id)
+    temp_result_dir = os.path.join(RESULT_FOLDER, file_id)
+    os.makedirs(temp_upload_dir, exist_ok=True)
+    os.makedirs(temp_result_dir, exist_ok=True)
+    return temp_upload_dir, temp_result_dir
+
+
+# 元数据内存缓存：写入一次、多次读取的场景下避免每次下载都读磁盘
+_META_CACHE = {}
+_META_CACHE_LOCK = threading.Lock()
+
+# 内容去重缓存：(内容哈希, 目标格式, 质量) -> 已有结果文件路径
+# 相同文件重复上传时直接硬链接旧结果，跳过整个转换流程
+_DEDUP_CACHE = {}
+_DEDUP_CACHE_LOCK = threading.Lock()
 
 
 def save_metadata(file_id, metadata):
     """保存文件元数据，包括原始文件名"""
     metadata_file = os.path.join(METADATA_FOLDER, f"{file_id}.json")
-    with open(metadata_file, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        with open(metadata_file, 'wb') as f:
+            f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+    else:
+        with open(metadata_file, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+    # 更新内存缓存，后续读取无需再访问磁盘
+    with _META_CACHE_LOCK:
+        _META_CACHE[file_id] = dict(metadata)
     return metadata_file
 
 
 def get_metadata(file_id):
-    """获取文件元数据"""
+    """获取文件元数据，优先从内存缓存读取"""
+    with _META_CACHE_LOCK:
+        cached = _META_CACHE.get(file_id)
+    if cached is not None:
+        return dict(cached)
     metadata_file = os.path.join(METADATA_FOLDER, f"{file_id}.json")
     if os.path.exists(metadata_file):
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        if orjson is not None:
+            with open(metadata_file, 'rb') as f:
+                metadata = orjson.loads(f.read())
+        else:
+            with open(metadata_file, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        with _META_CACHE_LOCK:
+            _META_CACHE[file_id] = dict(metadata)
+        return metadata
     return None
 
 
@@ -64,97 +271,68 @@ def index():
     })
 
 
+# 支持的转换格式是静态的，在模块加载时序列化一次，避免每次请求重建
+SUPPORTED_FORMATS = {
+    'pdf': ['docx', 'xlsx', 'pptx', 'jpg', 'png', 'scannable_pdf', 'scanned_pdf', 'searchable_pdf', 'dwg', 'dxf', 'cad'],
+    'jpg': ['pdf'],
+    'jpeg': ['pdf'],
+    'png': ['pdf'],
+    'docx': ['pdf'],
+    'doc': ['pdf'],
+    'xlsx': ['pdf'],
+    'xls': ['pdf'],
+    'pptx': ['pdf'],
+    'ppt': ['pdf'],
+    'txt': ['pdf'],
+    'md': ['pdf']
+}
+if orjson is not None:
+    _FORMATS_JSON = orjson.dumps(SUPPORTED_FORMATS)
+else:
+    _FORMATS_JSON = json.dumps(SUPPORTED_FORMATS, ensure_ascii=False).encode('utf-8')
+
+
 @app.route('/api/formats', methods=['GET'])
 def get_formats():
     """获取支持的转换格式列表"""
-    supported_formats = {
-        'pdf': ['docx', 'xlsx', 'pptx', 'jpg', 'png', 'scannable_pdf', 'scanned_pdf', 'searchable_pdf', 'dwg', 'dxf', 'cad'],
-        'jpg': ['pdf'],
-        'jpeg': ['pdf'],
-        'png': ['pdf'],
-        'docx': ['pdf'],
-        'doc': ['pdf'],
-        'xlsx': ['pdf'],
-        'xls': ['pdf'],
-        'pptx': ['pdf'],
-        'ppt': ['pdf'],
-        'txt': ['pdf'],
-        'md': ['pdf']
-    }
-    return jsonify(supported_formats)
+    return app.response_class(_FORMATS_JSON, mimetype='application/json')
+
+
+# 系统检查结果缓存：依赖探测和tesseract版本检查代价高且基本静态，缓存60秒
+_SYSTEM_CHECK_CACHE = {'time': 0.0, 'result': None}
 
 
 @app.route('/api/system-check', methods=['GET'])
 def system_check():
-    """检查系统依赖和转换器状态"""
+    """检查系统依赖和转换器状态（结果缓存60秒）"""
     try:
+        if _SYSTEM_CHECK_CACHE['result'] is not None and time.time() - _SYSTEM_CHECK_CACHE['time'] < 60:
+            return json_response(_SYSTEM_CHECK_CACHE['result'])
+
         # 检查目录
         directories = {
             "upload_dir": {"path": UPLOAD_FOLDER, "exists": os.path.exists(UPLOAD_FOLDER), "writable": os.access(UPLOAD_FOLDER, os.W_OK)},
             "result_dir": {"path": RESULT_FOLDER, "exists": os.path.exists(RESULT_FOLDER), "writable": os.access(RESULT_FOLDER, os.W_OK)}
         }
         
-        # 检查转换器依赖
-        converter_status = {}
-        
-        # 检查PDF转Word依赖
-        try:
-            from pdf2docx import Converter
-            converter_status["pdf2docx"] = "已安装"
-        except ImportError:
-            converter_status["pdf2docx"] = "未安装"
-            
-        # 检查PDF转Excel依赖
-        try:
-            import tabula
-            import pandas as pd
-            converter_status["tabula_pandas"] = "已安装"
-        except ImportError:
-            converter_status["tabula_pandas"] = "未安装"
-            
-        # 检查PDF转图片依赖
-        try:
-            from pdf2image import convert_from_path
-            converter_status["pdf2image"] = "已安装"
-        except ImportError:
-            converter_status["pdf2image"] = "未安装"
-            
-        # 检查PIL
-        try:
-            from PIL import Image
-            converter_status["PIL"] = "已安装"
-        except ImportError:
-            converter_status["PIL"] = "未安装"
-            
-        # 检查OCR依赖
-        try:
-            import pytesseract
-            converter_status["pytesseract"] = "已安装"
-            try:
-                version = pytesseract.get_tesseract_version()
-                converter_status["tesseract_version"] = str(version)
-            except:
-                converter_status["tesseract_version"] = "未检测到"
-        except ImportError:
-            converter_status["pytesseract"] = "未安装"
-        
-        # 检查中文字体
-        chinese_fonts = []
-        for font_path in [
-            r"C:\Windows\Fonts\simhei.ttf",  # 黑体
-            r"C:\Windows\Fonts\simsun.ttc",  # 宋体
-            r"C:\Windows\Fonts\msyh.ttc",    # 微软雅黑
-        ]:
-            if os.path.exists(font_path):
-                chinese_fonts.append(os.path.basename(font_path))
-        
-        converter_status["chinese_fonts"] = chinese_fonts
+        # 检查转换器依赖（启动时由converters.preload()探测）
+        converter_status = dict(CONVERTER_STATUS)
+
+        # OCR版本在启动时已探测，不再每次fork子进程
+        if converter_status.get("pytesseract") == "已安装":
+            converter_status["tesseract_version"] = TESSERACT_VERSION or "未检测到"
+
+        # 检查中文字体（启动时已探测）
+        converter_status["chinese_fonts"] = [os.path.basename(p) for p in AVAILABLE_FONTS]
             
-        return jsonify({
+        result = {
             "status": "运行中",
             "directories": directories,
             "converters": converter_status
-        })
+        }
+        _SYSTEM_CHECK_CACHE['result'] = result
+        _SYSTEM_CHECK_CACHE['time'] = time.time()
+        return json_response(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -166,12 +344,10 @@ def test_pdf():
         # 创建一个简单的测试PDF
         from reportlab.pdfgen import canvas
         from reportlab.lib.pagesizes import letter
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
         import uuid
-        
+
         # 创建测试文件路径
-        test_file_id = str(uuid.uuid4())
+        test_file_id = uuid.uuid4().hex
         test_filename = "测试中文文档.pdf"  # 使用一个明确的中文文件名进行测试
         
         # 为测试文件创建子目录
@@ -185,35 +361,11 @@ def test_pdf():
         # 创建PDF
         c = canvas.Canvas(test_output_path, pagesize=letter)
         
-        # 尝试注册中文字体
-        font_registered = False
-        for font_path in [
-            r"C:\Windows\Fonts\simhei.ttf",    # 黑体
-            r"C:\Windows\Fonts\simsun.ttc",    # 宋体
-            r"C:\Windows\Fonts\msyh.ttc"       # 微软雅黑
-        ]:
-            if os.path.exists(font_path):
-                try:
-                    font_name = os.path.basename(font_path).split('.')[0]
-                    if "simhei" in font_path.lower():
-                        pdfmetrics.registerFont(TTFont('SimHei', font_path))
-                        c.setFont('SimHei', 14)
-                        font_registered = True
-                        break
-                    elif "simsun" in font_path.lower():
-                        pdfmetrics.registerFont(TTFont('SimSun', font_path))
-                        c.setFont('SimSun', 14)
-                        font_registered = True
-                        break
-                    elif "msyh" in font_path.lower():
-                        pdfmetrics.registerFont(TTFont('MicrosoftYaHei', font_path))
-                        c.setFont('MicrosoftYaHei', 14)
-                        font_registered = True
-                        break
-                except Exception as e:
-                    logger.warning(f"注册字体失败: {str(e)}")
-        
-        if not font_registered:
+        # 中文字体在启动时已注册到ReportLab全局字体表，直接使用
+        font_registered = DEFAULT_CN_FONT is not None
+        if font_registered:
+            c.setFont(DEFAULT_CN_FONT, 14)
+        else:
             c.setFont('Helvetica', 14)
             test_text = "Chinese characters test - font registration failed."
         
@@ -279,28 +431,39 @@ def convert_file():
     if not allowed_file(file.filename):
         return jsonify({'error': '不支持的文件格式'}), 400
 
-    # 原始文件名和文件对象详情的调试输出
-    logger.info(f"接收到的原始请求文件名: {file.filename}")
-    logger.info(f"前端传递的原始文件名: {original_filename}")
-    logger.info(f"文件对象详情: {file}")
+    # 原始文件名和文件对象详情的调试输出（惰性格式化，日志被过滤时不做字符串拼接）
+    logger.info("接收到的原始请求文件名: %s, 前端传递的原始文件名: %s", file.filename, original_filename)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("文件对象详情: %s", file)
     
+    # 上传文件名只解析一次，后续全部复用
+    file_stem, file_ext = os.path.splitext(file.filename)
+    file_ext = file_ext[1:].lower()
+
     # 如果前端提供了原始文件名，则使用它；否则使用上传文件的文件名
     if original_filename and original_filename.strip():
         # 确保原始文件名有正确的扩展名
-        orig_ext = original_filename.rsplit('.', 1)[1].lower() if '.' in original_filename else ''
-        file_ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
-        
+        orig_stem, orig_ext = os.path.splitext(original_filename)
+        orig_ext = orig_ext[1:].lower()
+
         # 如果原始文件名没有扩展名或扩展名与实际文件不符，添加正确的扩展名
         if not orig_ext or orig_ext != file_ext:
-            original_filename = f"{original_filename.rsplit('.', 1)[0] if '.' in original_filename else original_filename}.{file_ext}"
-            logger.info(f"调整后的原始文件名(添加扩展名): {original_filename}")
+            original_filename = f"{orig_stem if orig_ext else original_filename}.{file_ext}"
+            logger.info("调整后的原始文件名(添加扩展名): %s", original_filename)
     else:
         # 如果没有提供原始文件名，则使用上传的文件名
         original_filename = file.filename
-    
+
     # 生成唯一文件ID用于内部追踪
-    file_id = str(uuid.uuid4())
-    file_extension = original_filename.rsplit('.', 1)[1].lower()
+    file_id = uuid.uuid4().hex
+
+    # 清理文件名，防止目录遍历攻击
+    original_filename = sanitize_filename(original_filename)
+    if not original_filename or not allowed_file(original_filename):
+        original_filename = f"{file_id}.{file_ext}"
+
+    original_name_without_ext, file_extension = os.path.splitext(original_filename)
+    file_extension = file_extension[1:].lower()
 
     if not from_format:
         from_format = file_extension
@@ -320,69 +483,80 @@ def convert_file():
         'quality': quality
     }
     metadata_file = save_metadata(file_id, metadata)
-    logger.info(f"已保存文件元数据: {metadata_file}")
+    logger.info("已保存文件元数据: %s", metadata_file)
 
     # 在上传目录中使用原始文件名保存文件
     # 为防止文件名冲突，在服务器端使用子目录(使用file_id创建临时工作目录)
-    temp_upload_dir = os.path.join(UPLOAD_FOLDER, file_id)
-    os.makedirs(temp_upload_dir, exist_ok=True)
+    # 上传和结果子目录在此一并创建，后续不再重复makedirs
+    temp_upload_dir, temp_result_dir = ensure_job_dirs(file_id)
     upload_path = os.path.join(temp_upload_dir, original_filename)
-    file.save(upload_path)
-    
+
+    # 双重保险：确认最终路径仍在上传目录内
+    real_upload_root = os.path.realpath(UPLOAD_FOLDER)
+    if os.path.commonpath([os.path.realpath(upload_path), real_upload_root]) != real_upload_root:
+        logger.error(f"检测到非法文件路径: {upload_path}")
+        return jsonify({'error': '非法的文件名'}), 400
+
+    content_id = save_upload_stream(file, upload_path)
+
     # 验证文件是否使用原始文件名保存成功
-    logger.info(f"保存的文件路径: {upload_path}")
     if os.path.exists(upload_path):
-        logger.info(f"文件成功保存为原始文件名，文件大小: {os.path.getsize(upload_path)} 字节")
+        logger.info("保存的文件路径: %s, 文件大小: %s 字节", upload_path, os.path.getsize(upload_path))
     else:
-        logger.error(f"文件保存失败，路径不存在: {upload_path}")
+        logger.error("文件保存失败，路径不存在: %s", upload_path)
         # 列出上传目录内容，检查实际保存的文件名
-        directory_contents = list_directory(temp_upload_dir)
-        logger.info(f"上传目录内容: {directory_contents}")
+        logger.info("上传目录内容: %s", list_directory(temp_upload_dir))
 
-    logger.info(f"已接收文件: {original_filename}, 类型: {from_format}, 转换目标: {to_format}")
+    logger.info("已接收文件: %s, 类型: %s, 转换目标: %s", original_filename, from_format, to_format)
 
     try:
-        # 清理较旧的文件
-        cleanup_old_files(UPLOAD_FOLDER, max_age_hours=24)
-        cleanup_old_files(RESULT_FOLDER, max_age_hours=24)
-        cleanup_old_files(METADATA_FOLDER, max_age_hours=24)
-
-        # 获取原始文件名（不含扩展名）
-        original_name_without_ext = os.path.splitext(original_filename)[0]
-        
         # 获取目标格式的扩展名
         target_ext = to_format
         if to_format in ['scannable_pdf', 'scanned_pdf', 'searchable_pdf']:
             target_ext = 'pdf'
         
-        # 为结果文件创建一个子目录，防止文件名冲突
-        temp_result_dir = os.path.join(RESULT_FOLDER, file_id)
-        os.makedirs(temp_result_dir, exist_ok=True)
-        
-        # 使用原始文件名构建输出文件名
+        # 使用原始文件名构建输出文件名（结果子目录已在上面创建）
         output_filename = f"{original_name_without_ext}.{target_ext}"
         output_path = os.path.join(temp_result_dir, output_filename)
 
-        # 根据转换类型调用相应的转换函数
-        try:
-            result = converters.convert_file(
-                upload_path,
-                to_format,
-                output_path,
-                quality,
-                original_filename  # 传递原始文件名给转换函数
-            )
-        except Exception as conv_error:
-            logger.error(f"文件转换过程中出错: {str(conv_error)}", exc_info=True)
-            return jsonify({'error': f"文件转换失败: {str(conv_error)}"}), 500
+        # 内容去重：相同文件+相同目标格式+相同质量的结果直接硬链接复用
+        dedup_key = (content_id, to_format, quality)
+        with _DEDUP_CACHE_LOCK:
+            cached_result_path = _DEDUP_CACHE.get(dedup_key)
 
-        # 获取转换后的路径
-        if not isinstance(result, dict) or "output_path" not in result:
-            error_msg = f"无效的转换结果: {result}"
-            logger.error(error_msg)
-            return jsonify({'error': error_msg}), 500
-            
-        result_path = result["output_path"]
+        result_path = None
+        if cached_result_path and os.path.exists(cached_result_path):
+            try:
+                os.link(cached_result_path, output_path)
+                result_path = output_path
+                logger.info("命中内容去重缓存，复用已有结果: %s", cached_result_path)
+            except OSError as e:
+                logger.warning(f"硬链接缓存结果失败，重新转换: {str(e)}")
+
+        if result_path is None:
+            # 根据转换类型调用相应的转换函数（提交到进程池执行，避免占用请求线程）
+            try:
+                future = CONVERT_EXECUTOR.submit(
+                    converters.convert_file,
+                    upload_path,
+                    to_format,
+                    output_path,
+                    quality,
+                    original_filename,  # 传递原始文件名给转换函数
+                    content_id  # 内容哈希，转换层用它做跨进程结果缓存
+                )
+                result = future.result()
+            except Exception as conv_error:
+                logger.error(f"文件转换过程中出错: {str(conv_error)}", exc_info=True)
+                return jsonify({'error': f"文件转换失败: {str(conv_error)}"}), 500
+
+            # 获取转换后的路径
+            if not isinstance(result, dict) or "output_path" not in result:
+                error_msg = f"无效的转换结果: {result}"
+                logger.error(error_msg)
+                return jsonify({'error': error_msg}), 500
+
+            result_path = result["output_path"]
         
         # 检查结果文件是否存在
         if not os.path.exists(result_path):
@@ -393,20 +567,28 @@ def convert_file():
         # 获取文件大小
         file_size = os.path.getsize(result_path)
         
-        # 如果转换函数生成的文件与预期的输出路径不同，则需要复制到预期的位置并使用原始文件名
+        # 如果转换函数生成的文件与预期的输出路径不同，则需要移动到预期的位置并使用原始文件名
         if result_path != output_path:
-            logger.info(f"转换函数生成了不同的输出路径: {result_path}，将复制到预期位置: {output_path}")
-            import shutil
-            # 确保目标目录存在
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            # 复制文件
-            shutil.copy2(result_path, output_path)
+            logger.info("转换函数生成了不同的输出路径: %s，将移动到预期位置: %s", result_path, output_path)
+            try:
+                # 同一文件系统下rename是O(1)，避免整文件读写
+                os.replace(result_path, output_path)
+            except OSError:
+                # 跨文件系统时回退到复制
+                import shutil
+                shutil.copy2(result_path, output_path)
             # 更新结果路径
             result_path = output_path
 
-        # 更新元数据
+        # 记录去重缓存，后续相同内容的请求直接复用该结果
+        with _DEDUP_CACHE_LOCK:
+            _DEDUP_CACHE[dedup_key] = result_path
+
+        # 更新元数据（MIME类型在此处确定一次，下载时不再猜测）
+        import mimetypes
         metadata['output_path'] = output_path
-        metadata['output_filename'] = output_filename 
+        metadata['output_filename'] = output_filename
+        metadata['mime_type'] = mimetypes.guess_type(output_filename)[0] or 'application/octet-stream'
         metadata['file_size'] = file_size
         metadata['conversion_time'] = time.strftime('%Y-%m-%d %H:%M:%S')
         save_metadata(file_id, metadata)
@@ -414,13 +596,13 @@ def convert_file():
         # 生成可访问的URL - 使用file_id作为唯一标识符
         result_url = f"/api/download/{file_id}"
 
-        logger.info(f"转换成功: {original_filename} -> {output_filename}")
+        logger.info("转换成功: %s -> %s", original_filename, output_filename)
         
         # 对于特殊格式，返回正确的格式信息
         response_format = to_format
         if to_format in ['scannable_pdf', 'scanned_pdf', 'searchable_pdf']:
             response_format = 'pdf'
-            logger.info(f"特殊格式处理: {to_format} 将在响应中显示为 {response_format}")
+            logger.info("特殊格式处理: %s 将在响应中显示为 %s", to_format, response_format)
 
         return jsonify({
             'success': True,
@@ -457,13 +639,9 @@ def download_file(file_id):
             logger.error(f"元数据中缺少文件名信息: {metadata}")
             return jsonify({'error': '文件元数据不完整'}), 500
             
-        # 构建文件的完整路径
+        # 构建文件的完整路径（不做exists探测，文件丢失时由send_file抛出FileNotFoundError）
         file_path = os.path.join(RESULT_FOLDER, file_id, output_filename)
-        
-        if not os.path.exists(file_path):
-            logger.error(f"请求的文件不存在: {file_path}")
-            return jsonify({'error': '文件不存在'}), 404
-        
+
         # 获取原始文件名的扩展名和输出文件扩展名
         original_name_without_ext = os.path.splitext(original_filename)[0]
         target_ext = os.path.splitext(output_filename)[1]
@@ -472,42 +650,47 @@ def download_file(file_id):
         download_filename = f"{original_name_without_ext}{target_ext}"
         
         # 记录原始文件名和下载文件名
-        logger.info(f"下载文件: {file_path}")
-        logger.info(f"元数据中的原始文件名: {original_filename}")
-        logger.info(f"元数据中的上传文件名: {uploaded_filename}")
-        logger.info(f"下载时使用的文件名: {download_filename}")
+        logger.info("下载文件: %s, 原始文件名: %s, 上传文件名: %s, 下载文件名: %s",
+                    file_path, original_filename, uploaded_filename, download_filename)
         
-        # 不使用 send_from_directory，改为直接发送文件并设置正确的头部
-        from flask import send_file, Response
-        import mimetypes
-        
-        # 获取文件的 MIME 类型
-        mime_type, _ = mimetypes.guess_type(file_path)
+        # MIME类型在转换时已写入元数据，缺失时才回退到按需猜测
+        mime_type = metadata.get('mime_type')
         if not mime_type:
-            mime_type = 'application/octet-stream'  # 默认二进制流
-        
+            import mimetypes
+            mime_type, _ = mimetypes.guess_type(file_path)
+            if not mime_type:
+                mime_type = 'application/octet-stream'  # 默认二进制流
+
         # 确保文件名编码正确
         import urllib.parse
         encoded_filename = urllib.parse.quote(download_filename)
-        
-        # 使用 send_file 并手动设置 Content-Disposition 头
-        response = send_file(
-            file_path,
-            mimetype=mime_type,
-            as_attachment=True
-        )
-        
+
+        # 转换结果以file_id唯一标识且不可变，适合HTTP缓存：
+        # 预计算ETag并开启条件请求，重复下载时返回304
+        try:
+            file_mtime = os.path.getmtime(file_path)
+            etag = f"{file_id}-{int(file_mtime)}"
+
+            # 使用 send_file 并手动设置 Content-Disposition 头
+            response = send_file(
+                file_path,
+                mimetype=mime_type,
+                as_attachment=True,
+                conditional=True,
+                etag=etag,
+                last_modified=file_mtime,
+                max_age=86400
+            )
+        except FileNotFoundError:
+            logger.error(f"请求的文件不存在: {file_path}")
+            return jsonify({'error': '文件不存在'}), 404
+
         # 为了兼容不同浏览器，同时提供 ASCII 和 UTF-8 编码的文件名
         response.headers.set(
-            'Content-Disposition', 
+            'Content-Disposition',
             f'attachment; filename="{encoded_filename}"; filename*=UTF-8\'\'{encoded_filename}'
         )
-        
-        # 添加缓存控制头，禁止缓存
-        response.headers.set('Cache-Control', 'no-cache, no-store, must-revalidate')
-        response.headers.set('Pragma', 'no-cache')
-        response.headers.set('Expires', '0')
-        
+
         return response
     except Exception as e:
         logger.error(f"下载文件时出错: {str(e)}")
@@ -516,50 +699,50 @@ def download_file(file_id):
 
 # 添加辅助函数列出目录内容
 def list_directory(directory_path):
-    """列出指定目录中的所有文件和子目录"""
+    """列出指定目录中的所有文件和子目录（单次scandir遍历，避免逐项stat）"""
     contents = []
     try:
-        for item in os.listdir(directory_path):
-            item_path = os.path.join(directory_path, item)
-            if os.path.isfile(item_path):
-                contents.append(f"[file] {item} ({os.path.getsize(item_path)} bytes)")
-            elif os.path.isdir(item_path):
-                contents.append(f"[dir] {item}")
+        with os.scandir(directory_path) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    contents.append(f"[file] {entry.name} ({entry.stat().st_size} bytes)")
+                elif entry.is_dir(follow_symlinks=False):
+                    contents.append(f"[dir] {entry.name}")
     except Exception as e:
         logger.error(f"列出目录内容时出错: {str(e)}")
     return contents
 
+
+def list_subdirectories(directory_path, limit=5):
+    """列出目录下最多limit个子目录及其内容"""
+    subdirs = []
+    try:
+        with os.scandir(directory_path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append({
+                        "name": entry.name,
+                        "contents": list_directory(entry.path)
+                    })
+                    if len(subdirs) >= limit:
+                        break
+    except Exception as e:
+        logger.error(f"列出子目录时出错: {str(e)}")
+    return subdirs
+
+
 @app.route('/api/list-files', methods=['GET'])
 def list_files():
     """API端点用于列出上传和结果目录中的文件"""
     upload_contents = list_directory(UPLOAD_FOLDER)
     result_contents = list_directory(RESULT_FOLDER)
-    
-    # 遍历上传目录的子目录，最多列出5个
-    upload_subdirs = []
-    for item in os.listdir(UPLOAD_FOLDER):
-        item_path = os.path.join(UPLOAD_FOLDER, item)
-        if os.path.isdir(item_path):
-            upload_subdirs.append({
-                "name": item,
-                "contents": list_directory(item_path)
-            })
-            if len(upload_subdirs) >= 5:
-                break
-    
-    # 遍历结果目录的子目录，最多列出5个
-    result_subdirs = []
-    for item in os.listdir(RESULT_FOLDER):
-        item_path = os.path.join(RESULT_FOLDER, item)
-        if os.path.isdir(item_path):
-            result_subdirs.append({
-                "name": item,
-                "contents": list_directory(item_path)
-            })
-            if len(result_subdirs) >= 5:
-                break
-    
-    return jsonify({
+
+    # 遍历上传和结果目录的子目录，各最多列出5个
+    upload_subdirs = list_subdirectories(UPLOAD_FOLDER, limit=5)
+    result_subdirs = list_subdirectories(RESULT_FOLDER, limit=5)
+
+
+    return json_response({
         "upload_directory": UPLOAD_FOLDER,
         "upload_contents": upload_contents,
         "upload_subdirs": upload_subdirs,
@@ -571,126 +754,8 @@ def list_files():
 
 @app.route('/test-upload')
 def test_upload_page():
-    """提供一个简单的文件上传测试页面"""
-    html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>文件上传测试</title>
-        <meta charset="UTF-8">
-        <style>
-            body { font-family: Arial, sans-serif; margin: 20px; }
-            .container { max-width: 800px; margin: 0 auto; }
-            .form-group { margin-bottom: 15px; }
-            label { display: block; margin-bottom: 5px; }
-            .btn { padding: 8px 16px; background-color: #4CAF50; color: white; border: none; cursor: pointer; }
-            .result { margin-top: 20px; padding: 10px; border: 1px solid #ddd; background-color: #f9f9f9; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>文件上传测试</h1>
-            <form id="uploadForm" enctype="multipart/form-data">
-                <div class="form-group">
-                    <label for="file">选择文件:</label>
-                    <input type="file" id="file" name="file" required>
-                </div>
-                <div class="form-group">
-                    <label for="toFormat">目标格式:</label>
-                    <select id="toFormat" name="to_format">
-                        <option value="pdf">PDF</option>
-                        <option value="docx">DOCX</option>
-                        <option value="xlsx">XLSX</option>
-                        <option value="searchable_pdf">可搜索PDF</option>
-                    </select>
-                </div>
-                <div class="form-group">
-                    <label for="quality">质量:</label>
-                    <select id="quality" name="quality">
-                        <option value="1">低</option>
-                        <option value="2" selected>中</option>
-                        <option value="3">高</option>
-                    </select>
-                </div>
-                <button type="submit" class="btn">上传并转换</button>
-            </form>
-            <div id="result" class="result" style="display:none;"></div>
-            <div id="debug" class="result" style="display:none;">
-                <h3>调试信息</h3>
-                <pre id="debugInfo"></pre>
-                <div id="fileInfo"></div>
-            </div>
-        </div>
-
-        <script>
-            document.getElementById('uploadForm').addEventListener('submit', function(e) {
-                e.preventDefault();
-                
-                // 显示文件名信息
-                var fileInput = document.getElementById('file');
-                var debugInfo = document.getElementById('debugInfo');
-                var fileInfoDiv = document.getElementById('fileInfo');
-                var file = fileInput.files[0];
-                
-                if (file) {
-                    debugInfo.textContent = 'File selected: ' + file.name + '\\n';
-                    debugInfo.textContent += 'File size: ' + file.size + ' bytes\\n';
-                    debugInfo.textContent += 'File type: ' + file.type + '\\n';
-                    
-                    // 显示文件对象的完整信息
-                    fileInfoDiv.innerHTML = '<h4>文件对象完整信息</h4>';
-                    for (var prop in file) {
-                        if (typeof file[prop] !== 'function') {
-                            fileInfoDiv.innerHTML += prop + ': ' + file[prop] + '<br>';
-                        }
-                    }
-                    
-                    document.getElementById('debug').style.display = 'block';
-                }
-                
-                var formData = new FormData(this);
-                
-                // 添加原始文件名参数
-                if (file) {
-                    formData.append('original_filename', file.name);
-                    debugInfo.textContent += '\\nAdded original_filename: ' + file.name;
-                }
-                
-                var resultDiv = document.getElementById('result');
-                
-                resultDiv.innerHTML = '<p>上传中，请稍候...</p>';
-                resultDiv.style.display = 'block';
-                
-                fetch('/api/convert', {
-                    method: 'POST',
-                    body: formData
-                })
-                .then(response => response.json())
-                .then(data => {
-                    if (data.success) {
-                        // 显示转换成功信息
-                        resultDiv.innerHTML = '<h3>转换成功!</h3>' +
-                            '<p>原始文件名: ' + data.original_name + '</p>' +
-                            '<p>文件大小: ' + data.file_size + ' 字节</p>' +
-                            '<p><a href="' + data.result_url + '" target="_blank">下载转换后的文件</a></p>';
-                            
-                        // 添加更多调试信息
-                        debugInfo.textContent += '\\nServer Response:\\n' + JSON.stringify(data, null, 2);
-                    } else {
-                        resultDiv.innerHTML = '<h3>转换失败</h3><p>' + data.error + '</p>';
-                    }
-                    document.getElementById('debug').style.display = 'block';
-                })
-                .catch(error => {
-                    resultDiv.innerHTML = '<h3>错误</h3><p>' + error + '</p>';
-                    console.error('Error:', error);
-                });
-            });
-        </script>
-    </body>
-    </html>
-    """
-    return html
+    """提供一个简单的文件上传测试页面（静态文件，由Werkzeug带缓存头发送）"""
+    return send_from_directory(app.static_folder, 'test_upload.html', max_age=3600)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,6 @@
+"""WSGI入口，供gunicorn/uWSGI等生产服务器使用
+
+示例:
+    gunicorn -k gthread --workers 4 --threads 4 --timeout 300 wsgi:application
+"""
+from app import app as application